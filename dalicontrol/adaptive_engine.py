@@ -54,13 +54,11 @@ class AdaptiveEngine:
     def __init__(
         self,
         lamp: LampController,
-        lamp_lock: threading.Lock,
         settings=None,
         nominal_power_watts: float = 40.0,
         preferences=None,
     ):
         self.lamp = lamp
-        self.lamp_lock = lamp_lock
         self.settings = settings
         self.nominal_power_watts = nominal_power_watts
         self.preferences = preferences  # UserPreferences instance (optional)
@@ -636,8 +634,7 @@ class AdaptiveEngine:
                         logger.info(
                             "ADAPTIVE: VACANT -> Dimming to %d%% as warning", dim_level
                         )
-                        with self.lamp_lock:
-                            self.lamp.set_brightness_pct(dim_level)
+                        self.lamp.set_brightness_pct(dim_level)
 
                         if self.on_action:
                             rationale = (
@@ -662,8 +659,7 @@ class AdaptiveEngine:
                             "ADAPTIVE: Person returned during dim -> restoring to %.0f%%",
                             restore_pct,
                         )
-                        with self.lamp_lock:
-                            self.lamp.set_brightness_pct(restore_pct)
+                        self.lamp.set_brightness_pct(restore_pct)
 
                         if self.on_action:
                             rationale = (
@@ -685,8 +681,7 @@ class AdaptiveEngine:
                                 "ADAPTIVE: Dim timer expired (%.0fs) -> turning OFF",
                                 dim_delay,
                             )
-                            with self.lamp_lock:
-                                self.lamp.off()
+                            self.lamp.off()
 
                             if self.on_action:
                                 rationale = (
@@ -714,12 +709,22 @@ class AdaptiveEngine:
                     self._last_eval_time = now
                     self._apply_adaptive(snap, reason="adaptive_eval")
 
+                wait_s = self._next_wait(now)
                 self._was_occupied = bool(occupied)
 
             except Exception as exc:
                 logger.error("Adaptive engine error: %s", exc)
+                wait_s = 1.0
 
-            self._stop.wait(1.0)
+            self._stop.wait(wait_s)
+
+    def _next_wait(self, now: float) -> float:
+        """Poll once a second; while dimming, shorten the last wait so the
+        off transition lands on the dim deadline."""
+        if self._vacancy_state == "dimming":
+            remaining = self._dim_delay - (now - self._vacancy_start)
+            return min(1.0, max(0.01, remaining))
+        return 1.0
 
     # ---- Apply adaptive lighting with rich context ----
 
@@ -782,8 +787,7 @@ class AdaptiveEngine:
         actions = []
 
         if brightness_delta >= self._brightness_threshold or self.lamp.state.is_off:
-            with self.lamp_lock:
-                self.lamp.set_brightness_pct(rec_brightness)
+            self.lamp.set_brightness_pct(rec_brightness)
             self._current_brightness_pct = rec_brightness
             actions.append(f"set_brightness_pct({rec_brightness:.0f})")
             logger.info(
@@ -793,8 +797,7 @@ class AdaptiveEngine:
 
         if cct_delta >= self._cct_threshold:
             dtr, dtr1 = kelvin_to_dtr(rec_cct)
-            with self.lamp_lock:
-                self.lamp.set_temp_raw(dtr, dtr1)
+            self.lamp.set_temp_raw(dtr, dtr1)
             self._current_cct_kelvin = rec_cct
             actions.append(f"set_cct({rec_cct}K)")
             logger.info(
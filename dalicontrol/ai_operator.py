@@ -1,59 +1,350 @@
 import json
 import importlib.util
+from collections import OrderedDict, deque
 import logging
 import os
 import re
+import threading
 import time
-from dataclasses import asdict
+from dataclasses import dataclass
+from enum import IntEnum
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
 
 from .dali_controls import DaliControls, clamp
 from .dali_transport import DaliHidTransport
 from .lamp_state import COOL_PRESET, LampController, LampState, WARM_PRESET
 from .paths import STATE_PATH
+
+logger = logging.getLogger(__name__)
+
+# orjson is optional; fall back to stdlib json with the same bytes interface
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2).encode("utf-8")
+
+    _loads = json.loads
+
 MAX_ACTIONS_PER_SEC = 4
+PLAN_CACHE_SIZE = 128
+
+
+class ActionType(IntEnum):
+    SET_BRIGHTNESS = 0
+    SET_WHITE = 1
+    SET_YELLOW = 2
+    OFF = 3
+    ON_LAST = 4
+
+
+# Wire names used by the LLM schema, indexed by ActionType
+_ACTION_NAMES = ("set_brightness_pct", "set_white", "set_yellow", "off", "on_last")
+_NAME_TO_ENUM = {name: ActionType(i) for i, name in enumerate(_ACTION_NAMES)}
+
+
+@dataclass(frozen=True)
+class Action:
+    """One planned lamp action; pct is only meaningful for SET_BRIGHTNESS."""
+
+    __slots__ = ("name", "pct")
+
+    name: ActionType
+    pct: Optional[float]
+
+    def __str__(self) -> str:
+        if self.name is ActionType.SET_BRIGHTNESS:
+            return f"{_ACTION_NAMES[self.name]}({self.pct})"
+        return _ACTION_NAMES[self.name]
+
+
+_OFF = Action(ActionType.OFF, None)
+_ON_LAST = Action(ActionType.ON_LAST, None)
+_SET_WHITE = Action(ActionType.SET_WHITE, None)
+_SET_YELLOW = Action(ActionType.SET_YELLOW, None)
+
+
+def _parse_actions(raw: List[Dict[str, Any]]) -> List[Action]:
+    """Convert LLM action dicts to Actions, dropping unknown names and
+    non-numeric percentages."""
+    actions: List[Action] = []
+    for item in raw:
+        kind = _NAME_TO_ENUM.get(item.get("action"))
+        if kind is None:
+            logger.debug("Ignoring unknown action from LLM: %s", item)
+            continue
+        pct = None
+        if kind is ActionType.SET_BRIGHTNESS:
+            try:
+                pct = float(item.get("pct", 0))
+            except (TypeError, ValueError):
+                logger.debug("Ignoring action with bad pct from LLM: %s", item)
+                continue
+        actions.append(Action(kind, pct))
+    return actions
+
+
+class _ArgsStream:
+    """Incremental scanner over streamed set_actions arguments.
+
+    Tracks JSON nesting so each action object (depth 5: root > plans >
+    plan > actions > action) and each plan object (depth 3) is parsed as
+    soon as its closing brace arrives, before the rest of the reply.
+    """
+
+    _INDEX_RE = re.compile(r'"utterance_index"\s*:\s*(\d+)')
+
+    def __init__(
+        self,
+        on_action: Callable[[int, Dict[str, Any]], None],
+        on_plan: Callable[[Dict[str, Any]], None],
+    ):
+        self.text = ""
+        self._depth = 0
+        self._starts: Dict[int, int] = {}
+        self._in_str = False
+        self._escape = False
+        self._on_action = on_action
+        self._on_plan = on_plan
+
+    def feed(self, chunk: str) -> None:
+        base = len(self.text)
+        self.text += chunk
+        for off, ch in enumerate(chunk):
+            if self._in_str:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_str = False
+            elif ch == '"':
+                self._in_str = True
+            elif ch in "{[":
+                self._depth += 1
+                self._starts[self._depth] = base + off
+            elif ch in "}]":
+                if ch == "}" and self._depth in (3, 5):
+                    self._close(self._depth, base + off + 1)
+                self._depth -= 1
+
+    def _close(self, depth: int, end: int) -> None:
+        try:
+            obj = json.loads(self.text[self._starts[depth]:end])
+        except ValueError:
+            logger.debug("Skipping malformed object in LLM arguments")
+            return
+        if depth == 3:
+            self._on_plan(obj)
+            return
+        # Only stream the action early if its plan already named its index
+        m = self._INDEX_RE.search(self.text, self._starts[3], self._starts[5])
+        if m:
+            self._on_action(int(m.group(1)), obj)
+
+
+class _InOrderDispatch:
+    """Releases actions to a callback in utterance order as they arrive.
+
+    Actions for the next pending utterance go out immediately; later
+    utterances are held until every earlier plan is complete.
+    """
+
+    def __init__(self, count: int, on_action: Optional[Callable[[Action], None]]):
+        self._on_action = on_action
+        self._done: List[Optional[List[Action]]] = [None] * count
+        self._seen: List[List[Action]] = [[] for _ in range(count)]
+        self._next = 0
+        self._sent = 0
+
+    def partial(self, idx: int) -> List[Action]:
+        return self._seen[idx]
+
+    def action(self, idx: int, act: Action) -> None:
+        self._seen[idx].append(act)
+        self._pump()
+
+    def complete(self, idx: int, plan: List[Action]) -> None:
+        self._done[idx] = plan
+        self._pump()
+
+    def _pump(self) -> None:
+        if self._on_action is None:
+            return
+        while self._next < len(self._done):
+            done = self._done[self._next]
+            src = done if done is not None else self._seen[self._next]
+            while self._sent < len(src):
+                act = src[self._sent]
+                self._sent += 1
+                self._on_action(act)
+            if done is None:
+                return
+            self._next += 1
+            self._sent = 0
+
+
+# Single-pass tokenizer for the rules fallback; dispatch on m.lastgroup.
+_RULES_RE = re.compile(
+    r"(?P<off>\boff\b)"
+    r"|(?P<on>\bon\b|turn on|restore|resume)"
+    r"|(?P<warm>warm|yellow)"
+    r"|(?P<cool>cool|white)"
+    r"|(?P<pct>\d{1,3})\s*%",
+    re.IGNORECASE,
+)
+
+# Sensor-status questions are answered locally instead of planned
+_SENSOR_Q_RE = re.compile(r"sensor|occupancy|presence|status", re.IGNORECASE)
+
+# LLM request constants, built once instead of per utterance.
+_SYSTEM_PROMPT = (
+    "You control a DALI lamp. Use minimal actions. "
+    "User lines are numbered from 0; return one plan per utterance_index."
+)
+
+_TOOL_SCHEMA = (
+    {
+        "type": "function",
+        "function": {
+            "name": "set_actions",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "plans": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "utterance_index": {"type": "integer"},
+                                "actions": {
+                                    "type": "array",
+                                    "items": {
+                                        "type": "object",
+                                        "properties": {
+                                            "action": {
+                                                "type": "string",
+                                                "enum": list(_ACTION_NAMES),
+                                            },
+                                            "pct": {"type": "number"},
+                                        },
+                                        "required": ["action"],
+                                    },
+                                },
+                            },
+                            "required": ["utterance_index", "actions"],
+                        },
+                    }
+                },
+                "required": ["plans"],
+            },
+        },
+    },
+)
 
 
 class NullControls:
     """No-op controls for dry runs; mirrors the LampController expectations."""
 
     def off(self):
-        logging.info("[dry-run] off()")
+        logger.info("[dry-run] off()")
 
     def set_arc_level(self, level: int):
-        logging.info("[dry-run] set_arc_level(%s)", level)
+        logger.info("[dry-run] set_arc_level(%s)", level)
 
     def dt8_set_temp_raw(self, dtr0: int, dtr1: int):
-        logging.info("[dry-run] dt8_set_temp_raw(%s, %s)", dtr0, dtr1)
+        logger.info("[dry-run] dt8_set_temp_raw(%s, %s)", dtr0, dtr1)
 
     def dt8_set_kelvin(self, kelvin: int):
-        logging.info("[dry-run] dt8_set_kelvin(%s)", kelvin)
+        logger.info("[dry-run] dt8_set_kelvin(%s)", kelvin)
 
 
 def load_state(path: Path = STATE_PATH) -> LampState:
     try:
-        with path.open("r", encoding="utf-8") as f:
-            payload = json.load(f)
-            return LampState(
-                last_level=int(payload.get("last_level", 254)),
-                last_temp=tuple(payload.get("last_temp", COOL_PRESET)),
-                is_off=bool(payload.get("is_off", False)),
-            )
+        payload = _loads(path.read_bytes())
+        return LampState(
+            last_level=int(payload.get("last_level", 254)),
+            last_temp=tuple(payload.get("last_temp", COOL_PRESET)),
+            is_off=bool(payload.get("is_off", False)),
+        )
     except FileNotFoundError:
         return LampState()
     except Exception as exc:
-        logging.warning("Failed to load state file %s: %s", path, exc)
+        logger.warning("Failed to load state file %s: %s", path, exc)
         return LampState()
 
 
-def save_state(state: LampState, path: Path = STATE_PATH) -> None:
+def save_state(state: LampState, path: Path = STATE_PATH, fsync: bool = False) -> None:
     try:
         path.parent.mkdir(parents=True, exist_ok=True)
-        with path.open("w", encoding="utf-8") as f:
-            json.dump(asdict(state), f, indent=2)
+        tmp = path.with_name(path.name + ".tmp")
+        with tmp.open("wb") as f:
+            f.write(_dumps({
+                "last_level": state.last_level,
+                "last_temp": list(state.last_temp),
+                "is_off": state.is_off,
+            }))
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
     except Exception as exc:
-        logging.error("Failed to persist state to %s: %s", path, exc)
+        logger.error("Failed to persist state to %s: %s", path, exc)
+
+
+class StatePersister:
+    """
+    Writes lamp state from a background thread, debounced.
+
+    mark_dirty() is cheap and never touches the disk; a burst of changes
+    within `debounce` seconds becomes one write.  stop() writes any pending
+    change and fsyncs it.
+    """
+
+    def __init__(
+        self,
+        get_state: Callable[[], LampState],
+        path: Path = STATE_PATH,
+        debounce: float = 0.5,
+    ):
+        self.get_state = get_state
+        self.path = path
+        self.debounce = debounce
+        self._dirty = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def mark_dirty(self) -> None:
+        self._dirty.set()
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="state-persister", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        self._dirty.set()  # wake the thread
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        save_state(self.get_state(), self.path, fsync=True)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._dirty.wait()
+            if self._stop.wait(self.debounce):
+                return
+            self._dirty.clear()
+            save_state(self.get_state(), self.path)
 
 
 class AIOperator:
@@ -65,165 +356,275 @@ class AIOperator:
     Occupancy automation is handled in main.py
     """
 
-    def __init__(self, lamp: LampController, state_path: Path = STATE_PATH, dry_run: bool = False):
+    def __init__(self, lamp: LampController, dry_run: bool = False):
         self.lamp = lamp
-        self.state_path = state_path
         self.dry_run = dry_run
 
-        self._action_times: List[float] = []
+        # Indexed by ActionType
+        self._dispatch: Tuple[Callable[[Action], None], ...] = (
+            lambda a: lamp.set_brightness_pct(a.pct),
+            lambda a: lamp.set_white(),
+            lambda a: lamp.set_yellow(),
+            lambda a: lamp.off(),
+            lambda a: lamp.on_last(),
+        )
+
+        self._action_times: Deque[float] = deque(maxlen=MAX_ACTIONS_PER_SEC)
+        self._api_key = os.getenv("OPENAI_API_KEY")
+        self._openai_model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
         self._openai_client = None
         self._openai_available_checked = False
+        self._openai_lock = threading.Lock()
+
+        # LLM plans keyed by normalized utterance (LRU, most recent last)
+        self._plan_cache: "OrderedDict[str, List[Action]]" = OrderedDict()
+
+        # Import openai, build the client and open a connection off the
+        # first-command path
+        if self._api_key:
+            threading.Thread(
+                target=self._warm_openai, name="openai-warmup", daemon=True
+            ).start()
 
     # ---------- LLM helpers ----------
     def _get_openai_client(self):
-        if self._openai_available_checked:
-            return self._openai_client
+        with self._openai_lock:
+            if self._openai_available_checked:
+                return self._openai_client
+
+            self._openai_available_checked = True
+            if not self._api_key:
+                logger.info("OPENAI_API_KEY not set; using rules-based parser.")
+                return None
 
-        self._openai_available_checked = True
-        api_key = os.getenv("OPENAI_API_KEY")
+            if importlib.util.find_spec("openai") is None:
+                logger.info("OpenAI package not installed; using rules-based parser.")
+                return None
 
-        if not api_key:
-            logging.info("OPENAI_API_KEY not set; using rules-based parser.")
-            return None
+            from openai import OpenAI
 
-        if importlib.util.find_spec("openai") is None:
-            logging.info("OpenAI package not installed; using rules-based parser.")
-            return None
+            try:
+                self._openai_client = OpenAI(api_key=self._api_key)
+                logger.info("OpenAI client initialized.")
+            except Exception as exc:
+                logger.warning("OpenAI unavailable, falling back to rules: %s", exc)
+                self._openai_client = None
 
-        from openai import OpenAI
+            return self._openai_client
 
+    def _warm_openai(self) -> None:
+        client = self._get_openai_client()
+        if client is None:
+            return
+        # Cheap request to pay DNS/TLS setup now; the pooled connection is
+        # reused by the first real completion.
         try:
-            self._openai_client = OpenAI(api_key=api_key)
-            logging.info("OpenAI client initialized.")
+            client.models.list()
         except Exception as exc:
-            logging.warning("OpenAI unavailable, falling back to rules: %s", exc)
-            self._openai_client = None
+            logger.debug("OpenAI warm-up request failed: %s", exc)
+
+    def _llm_plan_batch(
+        self,
+        texts: List[str],
+        on_action: Optional[Callable[[Action], None]] = None,
+    ) -> List[List[Action]]:
+        """Plan several utterances, serving repeats from the plan cache and
+        streaming the rest from a single LLM round trip.
 
-        return self._openai_client
+        If on_action is given, each action is passed to it in utterance
+        order as soon as it is known rather than after the whole reply.
+        """
+        dispatch = _InOrderDispatch(len(texts), on_action)
 
-    def _llm_plan(self, text: str) -> List[Dict[str, Any]]:
         client = self._get_openai_client()
         if client is None:
-            return self._rules_plan(text)
-
-        functions = [
-            {
-                "name": "set_actions",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "actions": {
-                            "type": "array",
-                            "items": {
-                                "type": "object",
-                                "properties": {
-                                    "action": {
-                                        "type": "string",
-                                        "enum": [
-                                            "set_brightness_pct",
-                                            "set_white",
-                                            "set_yellow",
-                                            "off",
-                                            "on_last",
-                                        ],
-                                    },
-                                    "pct": {"type": "number"},
-                                },
-                                "required": ["action"],
-                            },
-                        }
-                    },
-                    "required": ["actions"],
-                },
-            }
-        ]
-
-        try:
-            response = client.chat.completions.create(
-                model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
+            plans = [self._rules_plan(t) for t in texts]
+            for i, plan in enumerate(plans):
+                dispatch.complete(i, plan)
+            return plans
+
+        plans: List[List[Action]] = [[] for _ in texts]
+        misses: List[int] = []
+
+        for i, text in enumerate(texts):
+            key = text.strip().lower()
+            cached = self._plan_cache.get(key)
+            if cached is None:
+                misses.append(i)
+                continue
+            self._plan_cache.move_to_end(key)
+            logger.debug("Plan cache hit: %r", key)
+            plans[i] = list(cached)
+            dispatch.complete(i, plans[i])
+
+        if not misses:
+            return plans
+
+        fresh = self._request_plans(
+            client,
+            [texts[i] for i in misses],
+            on_action=lambda j, act: dispatch.action(misses[j], act),
+            on_plan=lambda j, plan: dispatch.complete(misses[j], plan),
+        )
+
+        for i, plan in zip(misses, fresh):
+            if plan is None:
+                # Keep whatever already streamed out; otherwise use rules
+                plans[i] = dispatch.partial(i) or self._rules_plan(texts[i])
+                dispatch.complete(i, plans[i])
+                continue
+            plans[i] = plan
+            dispatch.complete(i, plan)
+            self._plan_cache[texts[i].strip().lower()] = list(plan)
+            if len(self._plan_cache) > PLAN_CACHE_SIZE:
+                self._plan_cache.popitem(last=False)
+
+        return plans
+
+    def _request_plans(
+        self,
+        client,
+        texts: List[str],
+        on_action: Optional[Callable[[int, Action], None]] = None,
+        on_plan: Optional[Callable[[int, List[Action]], None]] = None,
+    ) -> List[Optional[List[Action]]]:
+        """Stream one chat completion for all texts; None entries (no plan
+        returned for that utterance) mean 'use rules'.
+
+        on_action(index, action) fires as each action object closes in the
+        streamed arguments, on_plan(index, actions) as each plan closes.
+        """
+        count = len(texts)
+        plans: List[Optional[List[Action]]] = [None] * count
+
+        def plan_closed(raw: Dict[str, Any]) -> None:
+            idx = raw.get("utterance_index")
+            if isinstance(idx, int) and 0 <= idx < count:
+                plans[idx] = _parse_actions(raw.get("actions", []))
+                if on_plan:
+                    on_plan(idx, plans[idx])
+
+        def action_closed(idx: int, raw: Dict[str, Any]) -> None:
+            if on_action and 0 <= idx < count:
+                for act in _parse_actions([raw]):
+                    on_action(idx, act)
+
+        args = _ArgsStream(action_closed, plan_closed)
+        numbered = "\n".join(f"{i}. {t}" for i, t in enumerate(texts))
+
+        def argument_chunks():
+            stream = client.chat.completions.create(
+                model=self._openai_model,
                 messages=[
-                    {
-                        "role": "system",
-                        "content": "You control a DALI lamp. Use minimal actions.",
-                    },
-                    {"role": "user", "content": text},
+                    {"role": "system", "content": _SYSTEM_PROMPT},
+                    {"role": "user", "content": numbered},
                 ],
-                tools=[{"type": "function", "function": functions[0]}],
+                tools=_TOOL_SCHEMA,
+                stream=True,
             )
-
-            call = response.choices[0].message.tool_calls
-            if not call:
-                return self._rules_plan(text)
-
-            args = json.loads(call[0].function.arguments)
-            return args.get("actions", [])
-
-        except Exception as exc:
-            logging.warning("LLM failed (%s); using rules.", exc)
-            return self._rules_plan(text)
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                for call in chunk.choices[0].delta.tool_calls or ():
+                    if call.index == 0 and call.function and call.function.arguments:
+                        yield call.function.arguments
+
+        # Only reading the stream counts as an LLM failure; errors from
+        # the callbacks (i.e. executing actions) propagate to the caller.
+        chunks = argument_chunks()
+        while True:
+            try:
+                piece = next(chunks)
+            except StopIteration:
+                break
+            except Exception as exc:
+                logger.warning("LLM failed (%s); using rules.", exc)
+                return plans
+            args.feed(piece)
+
+        # Plans the model omitted or sent malformed stay None
+        return plans
 
     # ---------- Rules fallback ----------
-    def _rules_plan(self, text: str) -> List[Dict[str, Any]]:
-        lowered = text.lower()
-        actions: List[Dict[str, Any]] = []
-
-        if "off" in lowered:
-            actions.append({"action": "off"})
-
-        if any(k in lowered for k in ["on", "restore", "resume"]):
-            actions.append({"action": "on_last"})
-
-        if any(k in lowered for k in ["warm", "yellow"]):
-            actions.append({"action": "set_yellow"})
-        elif any(k in lowered for k in ["cool", "white"]):
-            actions.append({"action": "set_white"})
-
-        m = re.search(r"(\d{1,3})\s*%", lowered)
-        if m:
-            actions.append(
-                {"action": "set_brightness_pct", "pct": clamp(int(m.group(1)), 0, 100)}
-            )
+    def _rules_plan(self, text: str) -> List[Action]:
+        if not text or text.isspace():
+            return []
+
+        want_off = want_on = want_warm = want_cool = False
+        pct: Optional[int] = None
+
+        for m in _RULES_RE.finditer(text):
+            kind = m.lastgroup
+            if kind == "off":
+                want_off = True
+            elif kind == "on":
+                want_on = True
+            elif kind == "warm":
+                want_warm = True
+            elif kind == "cool":
+                want_cool = True
+            elif kind == "pct" and pct is None:
+                pct = int(m.group("pct"))
+
+        actions: List[Action] = []
+
+        if want_off:
+            actions.append(_OFF)
+
+        if want_on:
+            actions.append(_ON_LAST)
+
+        if want_warm:
+            actions.append(_SET_YELLOW)
+        elif want_cool:
+            actions.append(_SET_WHITE)
+
+        if pct is not None:
+            actions.append(Action(ActionType.SET_BRIGHTNESS, clamp(pct, 0, 100)))
 
         return actions
 
     # ---------- Execution ----------
-    def _rate_limit(self):
-        now = time.monotonic()
-        self._action_times = [t for t in self._action_times if now - t < 1.0]
+    def _rate_limit(self, now: float) -> float:
+        """Sleep if the window is full; returns the time after any wait."""
+        while self._action_times and now - self._action_times[0] >= 1.0:
+            self._action_times.popleft()
 
         if len(self._action_times) >= MAX_ACTIONS_PER_SEC:
-            time.sleep(1.0 - (now - self._action_times[0]))
+            wait = 1.0 - (now - self._action_times[0])
+            time.sleep(wait)
+            now += wait
 
-    def _execute_action(self, action: str, params: Dict[str, Any]) -> None:
-        self._rate_limit()
+        return now
 
-        logging.info("Executing action: %s %s", action, params)
+    def _execute_action(self, action: Action, now: Optional[float] = None) -> None:
+        if now is None:
+            now = time.monotonic()
+        now = self._rate_limit(now)
 
-        if action == "set_brightness_pct":
-            self.lamp.set_brightness_pct(float(params.get("pct", 0)))
-        elif action == "set_white":
-            self.lamp.set_white()
-        elif action == "set_yellow":
-            self.lamp.set_yellow()
-        elif action == "off":
-            self.lamp.off()
-        elif action == "on_last":
-            self.lamp.on_last()
+        logger.info("Executing action: %s", action)
 
-        save_state(self.lamp.state, self.state_path)
-        self._action_times.append(time.monotonic())
+        self._dispatch[action.name](action)
+        self._action_times.append(now)
 
     # ---------- Public ----------
     def handle_user_text(self, text: str, sensor_status: Optional[dict] = None) -> None:
-        logging.info("User text: %s", text)
+        self.handle_user_texts([text], sensor_status=sensor_status)
+
+    def handle_user_texts(self, texts: List[str], sensor_status: Optional[dict] = None) -> None:
+        """Handle several user lines, planning all commands in one LLM request."""
+        commands: List[str] = []
+
+        for text in texts:
+            logger.debug("User text: %s", text)
+
+            if _SENSOR_Q_RE.search(text):
+                print(f"sensor> {sensor_status or '(no data)'}")
+                continue
 
-        lowered = text.lower().strip()
+            commands.append(text)
 
-        if any(k in lowered for k in ["sensor", "occupancy", "presence", "status"]):
-            print(f"sensor> {sensor_status or '(no data)'}")
+        if not commands:
             return
 
-        for act in self._llm_plan(text):
-            name = act.get("action")
-            params = {k: v for k, v in act.items() if k != "action"}
-            self._execute_action(name, params)
+        self._llm_plan_batch(commands, on_action=self._execute_action)
@@ -50,6 +50,21 @@ def level_to_pct(level: int) -> float:
     return round((max(0, min(254, level)) / 254.0) * 100.0, 1)
 
 
+# Whole-percent → ARC level (0..254), indexed by pct 0..100
+_PCT_TO_LEVEL = tuple(int(round((p / 100.0) * 254)) for p in range(101))
+
+
 def pct_to_level(pct: float) -> int:
-    """Convert percentage (0-100) to DALI ARC level (0-254)."""
-    return int(round((max(0.0, min(100.0, pct)) / 100.0) * 254))
+    """Convert percentage (0-100) to DALI ARC level (0-254).
+
+    Whole percents come from a lookup table; fractional ones use the same
+    formula directly.
+    """
+    if pct <= 0:
+        return 0
+    if pct >= 100:
+        return 254
+    whole = int(pct)
+    if whole == pct:
+        return _PCT_TO_LEVEL[whole]
+    return int(round((pct / 100.0) * 254))
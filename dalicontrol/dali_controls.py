@@ -1,19 +1,14 @@
 from __future__ import annotations
-import time
 from dataclasses import dataclass
 from typing import Callable, Dict, Any, List, Tuple, Optional
 
+from .cct_utils import pct_to_level
 from .dali_transport import DaliHidTransport
 
 # ---------- Helpers ----------
 
 def clamp(v, lo, hi):
-    return max(lo, min(hi, v))
-
-
-def pct_to_level(pct: float) -> int:
-    pct = clamp(float(pct), 0.0, 100.0)
-    return int(round((pct / 100.0) * 254))
+    return lo if v < lo else hi if v > hi else v
 
 
 # Typical tunable-white lamp range.  Adjust to your lamp's actual datasheet.
@@ -21,7 +16,7 @@ def pct_to_level(pct: float) -> int:
 MIREK_WARMEST = 370   # ≈ 2703 K  (lowest CCT / warmest)
 MIREK_COOLEST = 154   # ≈ 6494 K  (highest CCT / coolest)
 
-# Inter-frame gap in seconds.  The capture showed ~27 ms on the bus.
+# Settling time after a frame sequence.  The capture showed ~27 ms on the bus.
 # 30 ms gives a comfortable margin.
 DALI_FRAME_GAP = 0.030
 
@@ -52,11 +47,6 @@ class DaliControls:
     def __init__(self, tx: DaliHidTransport):
         self.tx = tx
 
-    # ── helpers ──────────────────────────────────────────────────────────
-    def _gap(self):
-        """Enforce inter-frame settling time."""
-        time.sleep(DALI_FRAME_GAP)
-
     # ── Brightness ──────────────────────────────────────────────────────
     def off(self):
         self.tx.send_dali16(0xFF, 0x00)
@@ -93,19 +83,24 @@ class DaliControls:
 
         Matches confirmed bus sequence from Wireshark capture:
           A3 dtr0 → C3 dtr1 → C1 08 → FF E7 → C1 08 → FF E2
-        with ~30 ms gaps between each frame.
+        Sent as one batch: short HID gaps between frames and a single
+        DALI_FRAME_GAP settle at the end.
+
+        Both C1 08 frames are required: Enable Device Type only applies to
+        the next command (IEC 62386-209), and Activate is itself a DT8
+        extended command, so it needs its own enable.
         """
-        self.tx.send_dali16(0xA3, dtr0)     # DTR0  (Mirek LSB)
-        self._gap()
-        self.tx.send_dali16(0xC3, dtr1)     # DTR1  (Mirek MSB)
-        self._gap()
-        self.dt8_enable()                    # Enable DT8
-        self._gap()
-        self.dt8_set_temp_tc()               # Set Temporary Tc
-        self._gap()
-        self.dt8_enable()                    # Enable DT8 again
-        self._gap()
-        self.dt8_activate()                  # Activate
+        self.tx.send_dali16_batch(
+            [
+                (0xA3, dtr0),   # DTR0  (Mirek LSB)
+                (0xC3, dtr1),   # DTR1  (Mirek MSB)
+                (0xC1, 0x08),   # Enable DT8
+                (0xFF, 0xE7),   # Set Temporary Tc
+                (0xC1, 0x08),   # Enable DT8 again
+                (0xFF, 0xE2),   # Activate
+            ],
+            trailing_pause=DALI_FRAME_GAP,
+        )
 
     def dt8_set_mirek(self, mirek: int):
         """Set colour temperature by Mirek value (clamped to lamp range)."""
@@ -204,27 +199,23 @@ COMMANDS: Dict[str, Dict[str, Any]] = {
 
 # ---------- Executor ----------
 
+_DISPATCH: Dict[str, Callable[..., Any]] = {
+    "off": lambda c, **kw: c.off(),
+    "recall_max": lambda c, **kw: c.recall_max(),
+    "recall_min": lambda c, **kw: c.recall_min(),
+    "set_brightness_level": lambda c, **kw: c.set_arc_level(kw["level"]),
+    "set_brightness_pct": lambda c, **kw: c.set_arc_pct(kw["pct"]),
+    "set_temp_raw": lambda c, **kw: c.dt8_set_temp_raw(kw["dtr0"], kw["dtr1"]),
+    "set_temp_mirek": lambda c, **kw: c.dt8_set_mirek(kw["mirek"]),
+    "set_temp_kelvin": lambda c, **kw: c.dt8_set_kelvin(kw["kelvin"]),
+    "set_temp_pct": lambda c, **kw: c.dt8_set_pct(kw["pct"]),
+    "set_temp_preset_warm": lambda c, **kw: c.dt8_set_kelvin(2700),
+    "set_temp_preset_cool": lambda c, **kw: c.dt8_set_kelvin(6500),
+}
+
+
 def execute_command(ctrl: DaliControls, name: str, **kwargs):
-    if name == "off":
-        return ctrl.off()
-    if name == "recall_max":
-        return ctrl.recall_max()
-    if name == "recall_min":
-        return ctrl.recall_min()
-    if name == "set_brightness_level":
-        return ctrl.set_arc_level(kwargs["level"])
-    if name == "set_brightness_pct":
-        return ctrl.set_arc_pct(kwargs["pct"])
-    if name == "set_temp_raw":
-        return ctrl.dt8_set_temp_raw(kwargs["dtr0"], kwargs["dtr1"])
-    if name == "set_temp_mirek":
-        return ctrl.dt8_set_mirek(kwargs["mirek"])
-    if name == "set_temp_kelvin":
-        return ctrl.dt8_set_kelvin(kwargs["kelvin"])
-    if name == "set_temp_pct":
-        return ctrl.dt8_set_pct(kwargs["pct"])
-    if name == "set_temp_preset_warm":
-        return ctrl.dt8_set_kelvin(2700)
-    if name == "set_temp_preset_cool":
-        return ctrl.dt8_set_kelvin(6500)
-    raise ValueError(f"Unknown command: {name}")
+    fn = _DISPATCH.get(name)
+    if fn is None:
+        raise ValueError(f"Unknown command: {name}")
+    return fn(ctrl, **kwargs)
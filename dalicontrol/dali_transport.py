@@ -1,9 +1,15 @@
 import hid
+import logging
 import time
+from typing import Iterable, Optional, Tuple
 
 VID = 0x17B5
 PID = 0x0020
 
+# Gap between frames inside a batch; the Lunatone HID drops frames below this.
+BATCH_FRAME_GAP = 0.003
+
+
 class DaliHidTransport:
     def __init__(self, vid=VID, pid=PID, pause=0.03):
         self.vid = vid
@@ -12,9 +18,24 @@ class DaliHidTransport:
         self._counter = 1
         self.dev = None
 
+        # Monotonic time before which the next frame must not go out.  Each
+        # send sets it instead of sleeping, so a caller that was idle for
+        # longer than the pause doesn't wait again.
+        self._next_allowed = 0.0
+
+        # Reused HID report: [report id 0x00] + 64-byte frame
+        #   12 <counter> 00 03 00 00 <b0> <b1> 00...
+        # Only the counter and the two DALI bytes change per send.
+        self._buf = bytearray(65)
+        self._buf[1] = 0x12
+        self._buf[4] = 0x03
+
     def open(self):
-        self.dev = hid.device()
-        self.dev.open(self.vid, self.pid)
+        # Only keep the handle once it is open, so a failed (re)open leaves
+        # dev as None and the next send tries again.
+        dev = hid.device()
+        dev.open(self.vid, self.pid)
+        self.dev = dev
 
     def close(self):
         if self.dev:
@@ -27,21 +48,60 @@ class DaliHidTransport:
             self._counter = 1
         return self._counter
 
-    def _make_frame(self, b0: int, b1: int) -> bytes:
-        b = bytearray(64)
-        b[0] = 0x12
-        b[1] = self._next_counter()
-        b[2] = 0x00
-        b[3] = 0x03
-        b[4] = 0x00
-        b[5] = 0x00
-        b[6] = b0 & 0xFF
-        b[7] = b1 & 0xFF
-        return bytes(b)
+    def _reopen(self) -> None:
+        try:
+            self.close()
+        except Exception:
+            self.dev = None
+        self.open()
+
+    def _write(self, b0: int, b1: int, gap: float) -> None:
+        """Write one frame, (re)opening the device if it is missing or the
+        write fails, and hold the next frame back for `gap` seconds."""
+        buf = self._buf
+        buf[2] = self._next_counter()
+        buf[7] = b0 & 0xFF
+        buf[8] = b1 & 0xFF
+        report = bytes(buf)
+        for attempt in (0, 1):
+            try:
+                if self.dev is None:
+                    self.open()
+                if self.dev.write(report) >= 0:
+                    break
+                raise OSError("HID write failed")
+            except (OSError, ValueError) as exc:  # hidapi: ValueError if not open
+                if attempt:
+                    raise
+                logging.warning("DALI HID write error (%s). Reopening device...", exc)
+                self._reopen()
+        self._next_allowed = time.monotonic() + gap
+
+    def _wait_time(self) -> float:
+        return self._next_allowed - time.monotonic()
+
+    def _pace(self) -> None:
+        remaining = self._wait_time()
+        if remaining > 0:
+            time.sleep(remaining)
 
     def send_dali16(self, b0: int, b1: int, pause=None):
-        if pause is None:
-            pause = self.pause
-        frame64 = self._make_frame(b0, b1)
-        self.dev.write(b"\x00" + frame64)
-        time.sleep(pause)
+        self._pace()
+        self._write(b0, b1, self.pause if pause is None else pause)
+
+    def send_dali16_batch(
+        self,
+        frames: Iterable[Tuple[int, int]],
+        inter_pause: float = BATCH_FRAME_GAP,
+        trailing_pause: Optional[float] = None,
+    ):
+        """Send several frames with a short gap between them and one
+        full pause at the end, instead of a full pause after each."""
+        frames = list(frames)
+        last = len(frames) - 1
+        for i, (b0, b1) in enumerate(frames):
+            self._pace()
+            if i < last:
+                self._write(b0, b1, inter_pause)
+            else:
+                self._write(b0, b1, self.pause if trailing_pause is None else trailing_pause)
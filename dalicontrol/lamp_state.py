@@ -1,8 +1,14 @@
+import logging
+import queue
+import threading
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from typing import Callable, Optional, Tuple
 
+from .cct_utils import pct_to_level
 from .dali_transport import DaliHidTransport
-from .dali_controls import DaliControls, pct_to_level, clamp
+from .dali_controls import DaliControls, clamp, kelvin_to_dtr
+
+logger = logging.getLogger(__name__)
 
 # Mirek-encoded presets (DTR0, DTR1):
 #   Warm: 370 Mirek ≈ 2703 K → DTR0=0x72, DTR1=0x01
@@ -10,6 +16,7 @@ from .dali_controls import DaliControls, pct_to_level, clamp
 WARM_PRESET = (0x72, 0x01)  # "yellow"
 COOL_PRESET = (0x9A, 0x00)  # "white"
 
+
 @dataclass
 class LampState:
     # Last applied brightness as ARC level 0..254
@@ -32,39 +39,37 @@ class LampController:
         self.state = state or LampState()
 
     # -------- Brightness ----------
-    def set_brightness_pct(self, pct: float):
-        pct = clamp(float(pct), 0.0, 100.0)
-        level = int(round((pct / 100.0) * 254))
-        self.ctrl.set_arc_level(level)
-        self.state.last_level = level
-        self.state.is_off = (level == 0)
+    # Setters skip the DALI send when the lamp is already there and return
+    # False; pass force=True to retransmit anyway (e.g. after a reconnect).
+    def set_brightness_pct(self, pct: float, force: bool = False) -> bool:
+        return self.set_brightness_level(pct_to_level(pct), force=force)
 
-    def set_brightness_level(self, level: int):
+    def set_brightness_level(self, level: int, force: bool = False) -> bool:
         level = clamp(int(level), 0, 254)
+        if not force and level == self.state.last_level and not self.state.is_off:
+            return False
         self.ctrl.set_arc_level(level)
         self.state.last_level = level
         self.state.is_off = (level == 0)
+        return True
 
     # -------- Tunable white ----------
-    def set_white(self):
-        self.ctrl.dt8_set_temp_raw(*COOL_PRESET)
-        self.state.last_temp = COOL_PRESET
+    def set_white(self, force: bool = False) -> bool:
+        return self.set_temp_raw(*COOL_PRESET, force=force)
 
-    def set_yellow(self):
-        self.ctrl.dt8_set_temp_raw(*WARM_PRESET)
-        self.state.last_temp = WARM_PRESET
+    def set_yellow(self, force: bool = False) -> bool:
+        return self.set_temp_raw(*WARM_PRESET, force=force)
 
-    def set_temp_raw(self, dtr0: int, dtr1: int):
-        dtr0 = clamp(int(dtr0), 0, 255)
-        dtr1 = clamp(int(dtr1), 0, 255)
-        self.ctrl.dt8_set_temp_raw(dtr0, dtr1)
-        self.state.last_temp = (dtr0, dtr1)
+    def set_temp_raw(self, dtr0: int, dtr1: int, force: bool = False) -> bool:
+        temp = (clamp(int(dtr0), 0, 255), clamp(int(dtr1), 0, 255))
+        if not force and temp == self.state.last_temp:
+            return False
+        self.ctrl.dt8_set_temp_raw(*temp)
+        self.state.last_temp = temp
+        return True
 
-    def set_temp_kelvin(self, kelvin: int):
-        self.ctrl.dt8_set_kelvin(kelvin)
-        from .dali_controls import kelvin_to_dtr
-        dtr0, dtr1 = kelvin_to_dtr(kelvin)
-        self.state.last_temp = (dtr0, dtr1)
+    def set_temp_kelvin(self, kelvin: int, force: bool = False) -> bool:
+        return self.set_temp_raw(*kelvin_to_dtr(kelvin), force=force)
 
     # -------- Power ----------
     def off(self):
@@ -90,6 +95,151 @@ class LampController:
         self.state.is_off = False
 
 
+# Command → channel, and which later channels make an earlier command moot.
+# Brightness is only superseded by brightness (off/on_last rely on the
+# remembered level); power state is superseded by any later power or
+# brightness command.
+_CMD_CHANNEL = {
+    "set_brightness_pct": "bright",
+    "set_brightness_level": "bright",
+    "set_white": "temp",
+    "set_yellow": "temp",
+    "set_temp_raw": "temp",
+    "set_temp_kelvin": "temp",
+    "off": "power",
+    "on_last": "power",
+}
+_SUPERSEDED_BY = {
+    "bright": {"bright"},
+    "temp": {"temp"},
+    "power": {"power", "bright"},
+}
+
+
+class LampWriter:
+    """
+    Single-writer front for a LampController.
+
+    Exposes the same command methods, but each call is queued and applied by
+    one daemon thread that owns the DALI transport.  Callers (sensor/adaptive
+    loop, CLI, web) never block on a slow DT8 sequence or on each other;
+    they only wait if the queue is full.
+
+    Commands that pile up while the writer is busy are coalesced: superseded
+    ones are dropped.  Ones that would not change the lamp are skipped by
+    LampController itself.
+    """
+
+    def __init__(
+        self,
+        lamp: LampController,
+        on_applied: Optional[Callable[[str], None]] = None,
+        maxsize: int = 16,
+        before_apply: Optional[Callable[[str], None]] = None,
+    ):
+        self.lamp = lamp
+        self.on_applied = on_applied  # called with the command name after it runs
+        self.before_apply = before_apply  # called with the command name before it runs
+        self._q: "queue.Queue[Optional[Tuple[str, tuple]]]" = queue.Queue(maxsize=maxsize)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def state(self) -> LampState:
+        return self.lamp.state
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name="lamp-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Apply everything already queued, then stop the writer thread."""
+        if not self._thread:
+            return
+        self._q.put(None)
+        self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def wait_idle(self) -> None:
+        """Block until every queued command has been applied."""
+        self._q.join()
+
+    def submit(self, cmd: str, *args) -> None:
+        self._q.put((cmd, args))
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._q.get()]
+            while batch[-1] is not None:
+                try:
+                    batch.append(self._q.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                for cmd, args in self._coalesce([i for i in batch if i is not None]):
+                    self._apply(cmd, args)
+            finally:
+                for _ in batch:
+                    self._q.task_done()
+
+            if batch[-1] is None:
+                return
+
+    @staticmethod
+    def _coalesce(batch):
+        """Drop commands overwritten later in the batch; keep arrival order."""
+        keep = []
+        seen = set()
+        for cmd, args in reversed(batch):
+            channel = _CMD_CHANNEL.get(cmd)
+            if channel is not None and _SUPERSEDED_BY[channel] & seen:
+                continue
+            if channel is not None:
+                seen.add(channel)
+            keep.append((cmd, args))
+        keep.reverse()
+        return keep
+
+    def _apply(self, cmd: str, args: tuple) -> None:
+        try:
+            if self.before_apply:
+                self.before_apply(cmd)
+            if getattr(self.lamp, cmd)(*args) is False:
+                logger.debug("Lamp command %s%s is a no-op; skipped", cmd, args)
+                return
+            if self.on_applied:
+                self.on_applied(cmd)
+        except Exception as exc:
+            logger.warning("Lamp command %s%s failed: %s", cmd, args, exc)
+
+    # -------- LampController API (queued) ----------
+    def set_brightness_pct(self, pct: float, force: bool = False):
+        self.submit("set_brightness_pct", pct, force)
+
+    def set_brightness_level(self, level: int, force: bool = False):
+        self.submit("set_brightness_level", level, force)
+
+    def set_white(self, force: bool = False):
+        self.submit("set_white", force)
+
+    def set_yellow(self, force: bool = False):
+        self.submit("set_yellow", force)
+
+    def set_temp_raw(self, dtr0: int, dtr1: int, force: bool = False):
+        self.submit("set_temp_raw", dtr0, dtr1, force)
+
+    def set_temp_kelvin(self, kelvin: int, force: bool = False):
+        self.submit("set_temp_kelvin", kelvin, force)
+
+    def off(self):
+        self.submit("off")
+
+    def on_last(self):
+        self.submit("on_last")
+
+
 if __name__ == "__main__":
     tx = DaliHidTransport(pause=0.05)
     tx.open()
@@ -2,6 +2,9 @@ import argparse
 import csv
 import logging
 import os
+import queue
+import selectors
+import sys
 import threading
 import time
 from dataclasses import asdict
@@ -9,11 +12,11 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-from .ai_operator import AIOperator, load_state, save_state
+from .ai_operator import AIOperator, StatePersister, load_state
 from .cct_utils import dtr_to_kelvin
 from .dali_controls import DaliControls
 from .dali_transport import DaliHidTransport
-from .lamp_state import LampController
+from .lamp_state import LampController, LampWriter
 from .paths import TELEM_DIR
 from .settings import Settings
 from .usb_occupancy import UsbOccupancyReader
@@ -221,6 +224,10 @@ def main():
     # ---- Lamp / DALI init ----
     state = load_state()
     tx: Optional[DaliHidTransport] = None
+    operator: Optional[AIOperator] = None
+    lamp_writer: Optional[LampWriter] = None
+    persister: Optional[StatePersister] = None
+    reader: Optional[UsbOccupancyReader] = None
 
     try:
         if args.dry_run:
@@ -231,11 +238,43 @@ def main():
             tx.open()
             controls = DaliControls(tx)
 
-        lamp = LampController(controls, state)
-        operator = AIOperator(lamp, dry_run=args.dry_run)
+        # ---- Runtime & energy tracking (shared mutable dict) ----
+        runtime_tracker = {
+            "total_s": 0.0,
+            "energy_wh": 0.0,
+            "_last_tick": time.time(),
+        }
+
+        runtime_lock = threading.Lock()
 
-        # A single lock for ALL lamp actions (sensor thread + AI thread + web)
-        lamp_lock = threading.Lock()
+        def account_runtime():
+            """Charge the time since the last call at the current lamp state."""
+            with runtime_lock:
+                now = time.time()
+                dt = now - runtime_tracker["_last_tick"]
+                runtime_tracker["_last_tick"] = now
+                lamp_state = lamp_writer.state
+                if not lamp_state.is_off:
+                    runtime_tracker["total_s"] += dt
+                    dimming_frac = lamp_state.last_level / 254.0
+                    runtime_tracker["energy_wh"] += (
+                        settings.nominal_power_watts * dimming_frac * dt / 3600.0
+                    )
+
+        # ALL lamp actions (adaptive engine, AI, CLI, web) are queued to a
+        # single writer thread that owns the DALI transport.  Runtime is
+        # accounted just before each command (at the state it replaces), and
+        # each applied command marks state dirty for the debounced persister.
+        persister = StatePersister(lambda: lamp_writer.state)
+        persister.start()
+        lamp_writer = LampWriter(
+            LampController(controls, state),
+            on_applied=lambda cmd: persister.mark_dirty(),
+            before_apply=lambda cmd: account_runtime(),
+        )
+        lamp_writer.start()
+        lamp = lamp_writer
+        operator = AIOperator(lamp, dry_run=args.dry_run)
 
         # ---- Sensor reader init ----
         reader = UsbOccupancyReader(args.sensor_port, args.sensor_baud)
@@ -243,17 +282,9 @@ def main():
 
         stop = threading.Event()
 
-        # ---- Runtime & energy tracking (shared mutable dict) ----
-        runtime_tracker = {
-            "total_s": 0.0,
-            "energy_wh": 0.0,
-            "_last_tick": time.time(),
-        }
-
         # ---- Shared mutable mode/auto (can be changed from web UI) ----
         app_state = {
             "lamp": lamp,
-            "lamp_lock": lamp_lock,
             "reader": reader,
             "telem": telem,
             "operator": operator,
@@ -277,7 +308,7 @@ def main():
         if args.mode == "ai":
             from .adaptive_engine import AdaptiveEngine
             adaptive_engine = AdaptiveEngine(
-                lamp, lamp_lock,
+                lamp,
                 settings=settings,
                 preferences=preferences,
             )
@@ -286,6 +317,8 @@ def main():
                 adaptive_engine.train_from_baseline()
 
             def on_adaptive_action(action_str, reason_str, rationale_str="", context=None):
+                # The action was only queued; log the state after it is applied
+                lamp.wait_idle()
                 snap = reader.snapshot()
                 telem.log_row(build_row(
                     mode=app_state["mode"], snap=snap, lamp=lamp,
@@ -314,19 +347,11 @@ def main():
 
             while not stop.is_set():
                 snap = reader.snapshot()
-                filt = snap.filt_occupied
 
                 now = time.time()
 
-                # --- Runtime & energy tracking ---
-                dt = now - runtime_tracker["_last_tick"]
-                runtime_tracker["_last_tick"] = now
-                if not lamp.state.is_off:
-                    runtime_tracker["total_s"] += dt
-                    dimming_frac = lamp.state.last_level / 254.0
-                    runtime_tracker["energy_wh"] += (
-                        settings.nominal_power_watts * dimming_frac * dt / 3600.0
-                    )
+                # --- Runtime & energy tracking (lamp changes account too) ---
+                account_runtime()
 
                 # --- Telemetry heartbeat: 5-second intervals (thesis spec) ---
                 if now - last_telem_at >= 5.0:
@@ -351,47 +376,137 @@ def main():
                         snap.last_line,
                     )
 
-                time.sleep(0.1)
-
-        def input_loop():
+                # Wake on the next occupancy change, or when the next periodic
+                # job (telemetry heartbeat, health log) is due.
+                next_due = min(last_telem_at + 5.0, last_log_at + 5.0)
+                try:
+                    reader.events.get(timeout=max(0.0, next_due - time.time()))
+                except queue.Empty:
+                    continue
+                # Only the latest status matters; drop any backlog
+                while True:
+                    try:
+                        reader.events.get_nowait()
+                    except queue.Empty:
+                        break
+
+        # Console lines are read on their own thread so the consumer below
+        # never sits inside a blocking input() call. None marks EOF.
+        user_q: "queue.Queue[Optional[str]]" = queue.Queue()
+
+        def stdin_reader_blocking():
             while not stop.is_set():
                 try:
-                    user_text = input("you> ").strip()
+                    user_q.put(input("you> "))
                 except (EOFError, KeyboardInterrupt):
-                    stop.set()
+                    user_q.put(None)
                     break
 
-                if not user_text:
+        def stdin_reader():
+            # Windows consoles can't be select()ed: SelectSelector accepts the
+            # fd but select() then fails, so go straight to input() there.
+            if sys.platform == "win32":
+                stdin_reader_blocking()
+                return
+
+            # Regular files can't be registered with epoll; same fallback.
+            sel = selectors.DefaultSelector()
+            try:
+                fd = sys.stdin.fileno()
+                sel.register(fd, selectors.EVENT_READ)
+            except (OSError, ValueError):
+                sel.close()
+                stdin_reader_blocking()
+                return
+
+            # POSIX: wait on stdin with a timeout so the thread sees stop.
+            # Read the raw fd (not sys.stdin) so no lines sit unseen in
+            # Python's buffer while select() reports nothing new.
+            pending = b""
+            select_failed = False
+            try:
+                sys.stdout.write("you> ")
+                sys.stdout.flush()
+                while not stop.is_set():
+                    try:
+                        ready = sel.select(timeout=0.5)
+                    except OSError as exc:
+                        logging.debug("stdin select() failed (%s); using input()", exc)
+                        select_failed = True
+                        break
+                    if not ready:
+                        continue
+                    chunk = os.read(fd, 4096)
+                    if not chunk:
+                        if pending:
+                            user_q.put(pending.decode("utf-8", errors="replace"))
+                        user_q.put(None)
+                        break
+                    *lines, pending = (pending + chunk).split(b"\n")
+                    for raw in lines:
+                        user_q.put(raw.decode("utf-8", errors="replace"))
+                    if lines:
+                        sys.stdout.write("you> ")
+                        sys.stdout.flush()
+            finally:
+                sel.close()
+
+            if select_failed:
+                if pending:
+                    user_q.put(pending.decode("utf-8", errors="replace"))
+                stdin_reader_blocking()
+
+        def input_loop():
+            while not stop.is_set():
+                try:
+                    lines = [user_q.get(timeout=0.5)]
+                except queue.Empty:
                     continue
 
-                snap = reader.snapshot()
-                sensor_status = {
-                    "raw_present": snap.raw_present,
-                    "filt_occupied": snap.filt_occupied,
-                    "moving": getattr(snap, "moving", None),
-                    "stationary": getattr(snap, "stationary", None),
-                    "lux": getattr(snap, "lux", None),
-                    "moving_age_ms": getattr(snap, "moving_age_ms", None),
-                    "moving_events": getattr(snap, "moving_events", None),
-                    "last_line": snap.last_line,
-                    "age_s": (time.time() - snap.updated_at) if snap.updated_at else None,
-                }
-
-                with lamp_lock:
-                    operator.handle_user_text(user_text, sensor_status=sensor_status)
-
-                    # Log AFTER the command so lamp state reflects the result
-                    telem.log_row(
-                        build_row(
-                            mode=app_state["mode"],
-                            snap=snap,
-                            lamp=lamp,
-                            runtime_tracker=runtime_tracker,
-                            action="user_command",
-                            reason="user_text",
-                            user_text=user_text,
+                # Pasted multi-line input arrives together; plan it as one batch
+                while lines[-1] is not None:
+                    try:
+                        lines.append(user_q.get_nowait())
+                    except queue.Empty:
+                        break
+
+                eof = lines[-1] is None
+                user_texts = [ln.strip() for ln in lines if ln is not None and ln.strip()]
+
+                if user_texts:
+                    snap = reader.snapshot()
+                    sensor_status = {
+                        "raw_present": snap.raw_present,
+                        "filt_occupied": snap.filt_occupied,
+                        "moving": getattr(snap, "moving", None),
+                        "stationary": getattr(snap, "stationary", None),
+                        "lux": getattr(snap, "lux", None),
+                        "moving_age_ms": getattr(snap, "moving_age_ms", None),
+                        "moving_events": getattr(snap, "moving_events", None),
+                        "last_line": snap.last_line,
+                        "age_s": (time.time() - snap.updated_at) if snap.updated_at else None,
+                    }
+
+                    operator.handle_user_texts(user_texts, sensor_status=sensor_status)
+
+                    # Log AFTER the commands are applied so lamp state reflects the result
+                    lamp_writer.wait_idle()
+                    for user_text in user_texts:
+                        telem.log_row(
+                            build_row(
+                                mode=app_state["mode"],
+                                snap=snap,
+                                lamp=lamp,
+                                runtime_tracker=runtime_tracker,
+                                action="user_command",
+                                reason="user_text",
+                                user_text=user_text,
+                            )
                         )
-                    )
+
+                if eof:
+                    stop.set()
+                    break
 
         # ---- Start threads ----
         t1 = threading.Thread(target=sensor_loop, name="sensor-loop", daemon=True)
@@ -407,21 +522,38 @@ def main():
         if not args.no_cli:
             t2 = threading.Thread(target=input_loop, name="input-loop", daemon=True)
             t2.start()
+            t3 = threading.Thread(target=stdin_reader, name="stdin-reader", daemon=True)
+            t3.start()
 
         logging.info(
             "Running. Auto=%s. Mode=%s. Web=%s. Ctrl-C to exit.",
             app_state["auto"], app_state["mode"], args.web,
         )
 
-        while not stop.is_set():
-            time.sleep(0.5)
+        while not stop.wait(0.5):
+            pass
 
     finally:
+        try:
+            if reader:
+                reader.stop()
+        except Exception:
+            pass
         if adaptive_engine:
             try:
                 adaptive_engine.stop()
             except Exception:
                 pass
+        try:
+            if lamp_writer:
+                lamp_writer.stop()
+        except Exception:
+            pass
+        try:
+            if persister:
+                persister.stop()
+        except Exception:
+            pass
         try:
             telem.close()
         except Exception:
@@ -1,14 +1,21 @@
 import json
 import logging
+import queue
 import threading
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from typing import Optional
 
 import serial
 
+# orjson is optional; both parse the raw bytes line directly
+try:
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
 
-@dataclass
+
+@dataclass(frozen=True)
 class OccupancyStatus:
     raw_present: Optional[bool] = None
     filt_occupied: Optional[bool] = None
@@ -44,7 +51,13 @@ class OccupancyStatus:
     last_moving_at: float = 0.0
     last_occupied_at: float = 0.0
     moving_events: int = 0        # counts rising edges of moving
-    moving_age_ms: int = -1       # ms since last moving=true (computed at snapshot time)
+
+    @property
+    def moving_age_ms(self) -> int:
+        """ms since last moving=true (computed when read, so it's always current)."""
+        if self.last_moving_at > 0:
+            return int((time.time() - self.last_moving_at) * 1000)
+        return -1
 
 
 class UsbOccupancyReader:
@@ -59,10 +72,13 @@ class UsbOccupancyReader:
         self.port = port
         self.baud = baud
         self.status = OccupancyStatus()
+
+        # Statuses pushed whenever raw/occupied changes (drop-oldest)
+        self.events: "queue.Queue[OccupancyStatus]" = queue.Queue(maxsize=64)
+
         self._stop = threading.Event()
         self._thread: Optional[threading.Thread] = None
         self._ser: Optional[serial.Serial] = None
-        self._lock = threading.Lock()
 
         # internal edge tracking
         self._moving_prev: Optional[bool] = None
@@ -83,16 +99,21 @@ class UsbOccupancyReader:
             pass
 
     def snapshot(self) -> OccupancyStatus:
-        with self._lock:
-            snap = OccupancyStatus(**self.status.__dict__)
-
-        # compute moving age at snapshot time (so it’s always current)
-        if snap.last_moving_at and snap.last_moving_at > 0:
-            snap.moving_age_ms = int((time.time() - snap.last_moving_at) * 1000)
-        else:
-            snap.moving_age_ms = -1
+        # Immutable and replaced whole on every line: no copy or lock needed.
+        return self.status
 
-        return snap
+    def _publish(self, evt: OccupancyStatus) -> None:
+        try:
+            self.events.put_nowait(evt)
+        except queue.Full:
+            try:
+                self.events.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                self.events.put_nowait(evt)
+            except queue.Full:
+                pass
 
     def _open(self) -> serial.Serial:
         return serial.Serial(self.port, self.baud, timeout=1, exclusive=True)
@@ -111,79 +132,89 @@ class UsbOccupancyReader:
                     pass
 
                 while not self._stop.is_set():
-                    line = self._ser.readline()
-                    if not line:
-                        continue
-
-                    try:
-                        text = line.decode("utf-8", errors="ignore").strip()
-                        if not text:
-                            continue
-
-                        data = json.loads(text)
-
-                        # Extract (backward compatible)
-                        raw_val = data.get("raw")
-                        occ_val = data.get("occupied")
-
-                        # NEW fields
-                        mov_val = data.get("moving")
-                        sta_val = data.get("stationary")
-                        lux_val = data.get("lux")
-
-                        now = time.time()
-
-                        with self._lock:
-                            if raw_val is not None:
-                                self.status.raw_present = bool(raw_val)
-
-                            if occ_val is not None:
-                                self.status.filt_occupied = bool(occ_val)
-                                if self.status.filt_occupied:
-                                    self.status.last_occupied_at = now
-
-                            if mov_val is not None:
-                                m = bool(mov_val)
-                                self.status.moving = m
-
-                                # rising edge count
-                                if self._moving_prev is False and m is True:
-                                    self.status.moving_events += 1
-                                self._moving_prev = m
-
-                                if m:
-                                    self.status.last_moving_at = now
-
-                            if sta_val is not None:
-                                self.status.stationary = bool(sta_val)
-
-                            if lux_val is not None:
-                                # BH1750 lux is float; accept int/float/str
-                                try:
-                                    self.status.lux = float(lux_val)
-                                except Exception:
-                                    pass
-
-                            # Parse extended sensor fields (additive, never break old firmware)
-                            for key in ("lux_smooth", "lux_ok", "move_dist", "move_energy",
-                                        "still_dist", "still_energy", "seq",
-                                        "confirm_count", "filter_stage"):
-                                val = data.get(key)
-                                if val is not None:
-                                    attr = "sensor_seq" if key == "seq" else key
-                                    setattr(self.status, attr, val)
-
-                            self.status.last_line = text
-                            self.status.updated_at = now
-
-                    except json.JSONDecodeError:
-                        continue
-                    except Exception:
-                        continue
+                    self._handle_line(self._ser.readline())
 
             except PermissionError:
                 logging.warning("USB Access Denied. Retrying in 2s...")
-                time.sleep(2)
+                self._stop.wait(2)
             except Exception as exc:
                 logging.warning("USB error (%s). Reconnecting in 2s...", exc)
-                time.sleep(2)
+                self._stop.wait(2)
+
+    def _handle_line(self, line: bytes) -> None:
+        line = line.strip()
+
+        # Boot banners / debug prints aren't JSON objects; skip
+        # them without decoding or raising.
+        if not line.startswith(b"{"):
+            return
+
+        try:
+            data = _loads(line)
+
+            # Extract (backward compatible)
+            raw_val = data.get("raw")
+            occ_val = data.get("occupied")
+
+            # NEW fields
+            mov_val = data.get("moving")
+            sta_val = data.get("stationary")
+            lux_val = data.get("lux")
+
+            now = time.time()
+            cur = self.status
+            changes = {}
+
+            if raw_val is not None:
+                changes["raw_present"] = bool(raw_val)
+
+            if occ_val is not None:
+                changes["filt_occupied"] = bool(occ_val)
+                if changes["filt_occupied"]:
+                    changes["last_occupied_at"] = now
+
+            if mov_val is not None:
+                m = bool(mov_val)
+                changes["moving"] = m
+
+                # rising edge count
+                if self._moving_prev is False and m is True:
+                    changes["moving_events"] = cur.moving_events + 1
+                self._moving_prev = m
+
+                if m:
+                    changes["last_moving_at"] = now
+
+            if sta_val is not None:
+                changes["stationary"] = bool(sta_val)
+
+            if lux_val is not None:
+                # BH1750 lux is float; accept int/float/str
+                try:
+                    changes["lux"] = float(lux_val)
+                except Exception:
+                    pass
+
+            # Parse extended sensor fields (additive, never break old firmware)
+            for key in ("lux_smooth", "lux_ok", "move_dist", "move_energy",
+                        "still_dist", "still_energy", "seq",
+                        "confirm_count", "filter_stage"):
+                val = data.get(key)
+                if val is not None:
+                    attr = "sensor_seq" if key == "seq" else key
+                    changes[attr] = val
+
+            changes["last_line"] = line.decode("utf-8", errors="ignore")
+            changes["updated_at"] = now
+
+            # Single writer: readers see either the old or the new status.
+            new = replace(cur, **changes)
+            self.status = new
+
+            if (new.raw_present, new.filt_occupied) != (cur.raw_present, cur.filt_occupied):
+                self._publish(new)
+
+        except json.JSONDecodeError:  # orjson.JSONDecodeError subclasses it
+            return
+        except Exception:
+            return
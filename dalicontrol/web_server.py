@@ -113,8 +113,7 @@ def create_app(app_state: dict) -> FastAPI:
     """Create the FastAPI application with references to shared state.
 
     app_state must contain:
-        lamp: LampController
-        lamp_lock: threading.Lock
+        lamp: LampWriter (queued; the writer thread persists state)
         reader: UsbOccupancyReader
         telem: TelemetryLogger
         operator: AIOperator
@@ -182,34 +181,29 @@ def create_app(app_state: dict) -> FastAPI:
         }
 
     # ---- Lamp Control ----
+    # Plain `def` so FastAPI runs these in its threadpool: submitting to the
+    # lamp writer blocks while its queue is full, which must not stall the
+    # event loop.
 
     @app.post("/api/lamp/brightness")
-    async def set_brightness(req: BrightnessRequest):
-        with app_state["lamp_lock"]:
-            app_state["lamp"].set_brightness_pct(req.pct)
-            _save_state(app_state)
+    def set_brightness(req: BrightnessRequest):
+        app_state["lamp"].set_brightness_pct(req.pct)
         return {"ok": True, "brightness_pct": req.pct}
 
     @app.post("/api/lamp/cct")
-    async def set_cct(req: CCTRequest):
+    def set_cct(req: CCTRequest):
         dtr, dtr1 = kelvin_to_dtr(req.kelvin)
-        with app_state["lamp_lock"]:
-            app_state["lamp"].set_temp_raw(dtr, dtr1)
-            _save_state(app_state)
+        app_state["lamp"].set_temp_raw(dtr, dtr1)
         return {"ok": True, "cct_kelvin": req.kelvin}
 
     @app.post("/api/lamp/on")
-    async def lamp_on():
-        with app_state["lamp_lock"]:
-            app_state["lamp"].on_last()
-            _save_state(app_state)
+    def lamp_on():
+        app_state["lamp"].on_last()
         return {"ok": True}
 
     @app.post("/api/lamp/off")
-    async def lamp_off():
-        with app_state["lamp_lock"]:
-            app_state["lamp"].off()
-            _save_state(app_state)
+    def lamp_off():
+        app_state["lamp"].off()
         return {"ok": True}
 
     # ---- Mode ----
@@ -234,7 +228,6 @@ def create_app(app_state: dict) -> FastAPI:
                         app_state["preferences"] = prefs
                     engine = AdaptiveEngine(
                         app_state["lamp"],
-                        app_state["lamp_lock"],
                         settings=app_state.get("settings"),
                         preferences=prefs,
                     )
@@ -247,6 +240,8 @@ def create_app(app_state: dict) -> FastAPI:
                     lamp = app_state["lamp"]
 
                     def on_adaptive_action(action_str, reason_str, rationale_str="", context=None):
+                        # The action was only queued; log the state after it is applied
+                        lamp.wait_idle()
                         snap = reader.snapshot()
                         if telem:
                             telem.log_row(build_row(
@@ -488,12 +483,6 @@ def create_app(app_state: dict) -> FastAPI:
     return app
 
 
-def _save_state(app_state):
-    """Persist lamp state after manual control changes."""
-    from .ai_operator import save_state
-    save_state(app_state["lamp"].state)
-
-
 def run_server(app_state: dict, host: str = "127.0.0.1", port: int = 8080):
     """Run the web server in a background thread."""
     import uvicorn
@@ -28,6 +28,8 @@ a = Analysis(
         "serial",
         "serial.tools",
         "serial.tools.list_ports",
+        # --- Optional fast JSON (state.json, sensor lines) ---
+        "orjson",
         # --- FastAPI / Uvicorn ---
         "uvicorn",
         "uvicorn.logging",
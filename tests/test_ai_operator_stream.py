@@ -0,0 +1,221 @@
+"""Tests for the streamed tool-call parsing and in-order dispatch."""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from dalicontrol.ai_operator import (
+    Action,
+    ActionType,
+    AIOperator,
+    NullControls,
+    _ArgsStream,
+    _InOrderDispatch,
+    _parse_actions,
+)
+from dalicontrol.lamp_state import LampController
+
+OFF = Action(ActionType.OFF, None)
+WHITE = Action(ActionType.SET_WHITE, None)
+
+
+def _pct(value):
+    return Action(ActionType.SET_BRIGHTNESS, value)
+
+
+def _arguments(plans):
+    return json.dumps({"plans": plans})
+
+
+def _collect_stream():
+    actions, plans = [], []
+    stream = _ArgsStream(
+        lambda idx, raw: actions.append((idx, raw)),
+        plans.append,
+    )
+    return stream, actions, plans
+
+
+# ---------- _ArgsStream ----------
+
+def test_args_stream_reports_actions_and_plans_across_chunk_boundaries():
+    stream, actions, plans = _collect_stream()
+    text = _arguments([
+        {"utterance_index": 0, "actions": [{"action": "off"}]},
+        {"utterance_index": 1, "actions": [
+            {"action": "set_brightness_pct", "pct": 40},
+            {"action": "set_white"},
+        ]},
+    ])
+
+    for ch in text:
+        stream.feed(ch)
+
+    assert actions == [
+        (0, {"action": "off"}),
+        (1, {"action": "set_brightness_pct", "pct": 40}),
+        (1, {"action": "set_white"}),
+    ]
+    assert [p["utterance_index"] for p in plans] == [0, 1]
+    assert stream.text == text
+
+
+def test_args_stream_ignores_braces_and_quotes_inside_strings():
+    stream, actions, plans = _collect_stream()
+    stream.feed(_arguments([
+        {"utterance_index": 0, "note": "a } \"quoted\" { [", "actions": [{"action": "off"}]},
+    ]))
+
+    assert actions == [(0, {"action": "off"})]
+    assert len(plans) == 1
+
+
+def test_args_stream_holds_actions_until_plan_names_its_index():
+    stream, actions, plans = _collect_stream()
+    stream.feed(_arguments([
+        {"actions": [{"action": "off"}], "utterance_index": 0},
+    ]))
+
+    assert actions == []
+    assert plans == [{"actions": [{"action": "off"}], "utterance_index": 0}]
+
+
+def test_args_stream_skips_malformed_objects():
+    stream, actions, plans = _collect_stream()
+    stream.feed('{"plans": [{"utterance_index": 0, "actions": [{"action": off}]}]}')
+
+    assert actions == []
+    assert plans == []
+
+
+# ---------- _InOrderDispatch ----------
+
+def test_dispatch_holds_later_utterances_until_earlier_complete():
+    sent = []
+    dispatch = _InOrderDispatch(2, sent.append)
+
+    dispatch.action(1, WHITE)
+    assert sent == []
+
+    dispatch.action(0, OFF)
+    assert sent == [OFF]
+
+    dispatch.complete(0, [OFF])
+    assert sent == [OFF, WHITE]
+
+    dispatch.complete(1, [WHITE, _pct(30)])
+    assert sent == [OFF, WHITE, _pct(30)]
+
+
+def test_dispatch_does_not_resend_streamed_actions_on_complete():
+    sent = []
+    dispatch = _InOrderDispatch(1, sent.append)
+
+    dispatch.action(0, OFF)
+    dispatch.complete(0, [OFF, WHITE])
+
+    assert sent == [OFF, WHITE]
+
+
+def test_dispatch_without_callback_only_tracks_partials():
+    dispatch = _InOrderDispatch(1, None)
+    dispatch.action(0, OFF)
+
+    assert dispatch.partial(0) == [OFF]
+
+
+# ---------- _parse_actions ----------
+
+def test_parse_actions_coerces_pct_and_drops_bad_items():
+    parsed = _parse_actions([
+        {"action": "set_brightness_pct", "pct": "50"},
+        {"action": "set_brightness_pct", "pct": "bright"},
+        {"action": "dance"},
+        {"action": "off"},
+    ])
+
+    assert parsed == [_pct(50.0), OFF]
+
+
+# ---------- AIOperator._request_plans ----------
+
+def _fake_client(pieces, fail_after=None):
+    def create(**kwargs):
+        for n, piece in enumerate(pieces):
+            if fail_after is not None and n == fail_after:
+                raise ConnectionError("stream dropped")
+            call = SimpleNamespace(index=0, function=SimpleNamespace(arguments=piece))
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(tool_calls=[call]))])
+
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+
+@pytest.fixture
+def operator(monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    return AIOperator(LampController(NullControls()), dry_run=True)
+
+
+def _split(text, size=7):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def test_request_plans_streams_actions_and_returns_plans(operator):
+    text = _arguments([
+        {"utterance_index": 0, "actions": [{"action": "off"}]},
+        {"utterance_index": 1, "actions": [{"action": "set_brightness_pct", "pct": 20}]},
+    ])
+    streamed = []
+
+    plans = operator._request_plans(
+        _fake_client(_split(text)), ["off", "20%"],
+        on_action=lambda idx, act: streamed.append((idx, act)),
+    )
+
+    assert plans == [[OFF], [_pct(20.0)]]
+    assert streamed == [(0, OFF), (1, _pct(20.0))]
+
+
+def test_request_plans_stream_error_keeps_completed_plans(operator):
+    text = _arguments([
+        {"utterance_index": 0, "actions": [{"action": "off"}]},
+        {"utterance_index": 1, "actions": [{"action": "set_white"}]},
+    ])
+    pieces = _split(text)
+    cut = text.index('{"utterance_index": 1') // 7 + 1
+
+    plans = operator._request_plans(_fake_client(pieces, fail_after=cut), ["off", "white"])
+
+    assert plans == [[OFF], None]
+
+
+def test_request_plans_propagates_action_errors(operator):
+    text = _arguments([{"utterance_index": 0, "actions": [{"action": "off"}]}])
+
+    def fail(idx, act):
+        raise RuntimeError("lamp unavailable")
+
+    with pytest.raises(RuntimeError, match="lamp unavailable"):
+        operator._request_plans(_fake_client(_split(text)), ["off"], on_action=fail)
+
+
+def test_request_plans_leaves_omitted_and_malformed_plans_as_none(operator):
+    text = (
+        '{"plans": [{"utterance_index": 0, "actions": [{"action": "off"}]}, '
+        '{"utterance_index": 2, "actions": [{"action": off}]}]}'
+    )
+
+    plans = operator._request_plans(_fake_client(_split(text)), ["off", "set 40%", "white"])
+
+    assert plans == [[OFF], None, None]
+
+
+def test_plan_batch_falls_back_to_rules_and_caches_only_model_plans(operator):
+    text = _arguments([{"utterance_index": 0, "actions": [{"action": "off"}]}])
+    operator._get_openai_client = lambda: _fake_client(_split(text))
+
+    plans = operator._llm_plan_batch(["off", "set 40%"])
+
+    assert plans == [[OFF], [_pct(40)]]
+    assert list(operator._plan_cache) == ["off"]
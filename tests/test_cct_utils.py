@@ -0,0 +1,20 @@
+"""Tests for the shared percent -> ARC level conversion."""
+
+from dalicontrol.cct_utils import pct_to_level
+
+
+def _formula(pct):
+    pct = max(0.0, min(100.0, float(pct)))
+    return int(round((pct / 100.0) * 254))
+
+
+def test_pct_to_level_matches_formula_for_whole_and_fractional_percents():
+    values = [p / 100.0 for p in range(-500, 10501)]
+    assert [pct_to_level(v) for v in values] == [_formula(v) for v in values]
+
+
+def test_pct_to_level_clamps_out_of_range():
+    assert pct_to_level(-5) == 0
+    assert pct_to_level(0.19) == 0
+    assert pct_to_level(100) == 254
+    assert pct_to_level(250) == 254